@@ -0,0 +1,114 @@
+"""
+Alignment kernels for data_retriever, with optional ahead-of-time compilation.
+
+By default the kernels are JIT compiled with numba (cache=True), which still
+costs ~1s of compile time on the first cold call. Running this module as a
+script compiles them into a platform extension module instead:
+
+    python _align_kernels.py
+
+When the compiled _align_kernels_aot module is present it is preferred, so
+importers skip the JIT warm-up entirely; behavior is identical either way.
+"""
+import numba
+import numpy as np
+
+
+def _trim_and_cumtime_impl(vals, relTime, range_lo, range_hi, disTimeAddBack_sec):
+    """
+    Select in-range base-PV samples and accumulate their relative time in a
+    single pass.
+
+    Parameters:
+    - vals (np.ndarray): Base PV values.
+    - relTime (np.ndarray): Relative time of each sample in seconds.
+    - range_lo, range_hi (np.ndarray): Lower/upper bounds of the valid ranges.
+    - disTimeAddBack_sec (float): Time added back at each discontinuity.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray, np.ndarray]: kept sample indices,
+      cumulated time per kept sample, and the kept-array positions where a
+      discontinuity was bridged.
+    """
+    n = vals.shape[0]
+    idt = np.empty(n, dtype=np.int64)
+    time_cum = np.empty(n, dtype=np.float64)
+    diff_idt = np.empty(n, dtype=np.int64)
+    m = 0          # number of kept samples
+    ndis = 0       # number of discontinuities
+    prev = -1      # raw index of the previously kept sample
+    t = 0.0
+    for i in range(n):
+        keep = False
+        for r in range(range_lo.shape[0]):
+            if vals[i] >= range_lo[r] and vals[i] <= range_hi[r]:
+                keep = True
+                break
+        if not keep:
+            continue
+        if prev >= 0:
+            if i - prev > 1:
+                # Discontinuity: add back the configured interval instead of
+                # the (trimmed-out) wall-clock gap
+                t += disTimeAddBack_sec
+                diff_idt[ndis] = m
+                ndis += 1
+            else:
+                t += relTime[i] - relTime[prev]
+        idt[m] = i
+        time_cum[m] = t
+        m += 1
+        prev = i
+    return idt[:m].copy(), time_cum[:m].copy(), diff_idt[:ndis].copy()
+
+
+@numba.guvectorize(['void(f8[:], f8[:], f8[:], i8, f8[:])'],
+                   '(n),(m),(m),()->(n)', nopython=True, cache=True)
+def interp_padded(x_new, xp, fp, m, out):
+    """
+    Linearly interpolate one padded row at the shared sample points.
+
+    Broadcasting over a stack of rows interpolates every PV in one call;
+    the rows are padded to a common width and `m` gives each row's true
+    length, so the padding is never read. Points outside [xp[0], xp[m-1]]
+    are filled with NaN, matching np.interp(..., left=np.nan, right=np.nan).
+    """
+    for i in range(x_new.shape[0]):
+        x = x_new[i]
+        if x < xp[0] or x > xp[m - 1]:
+            out[i] = np.nan
+            continue
+        lo = 0
+        hi = m - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if xp[mid] <= x:
+                lo = mid
+            else:
+                hi = mid
+        span = xp[lo + 1] - xp[lo]
+        if span == 0.0:
+            # Repeated time stamps (zero-length segment)
+            out[i] = fp[lo]
+        else:
+            w = (x - xp[lo]) / span
+            out[i] = fp[lo] + w * (fp[lo + 1] - fp[lo])
+
+
+_TRIM_CUMTIME_SIG = 'Tuple((i8[:], f8[:], i8[:]))(f8[:], f8[:], f8[:], f8[:], f8)'
+
+trim_and_cumtime = numba.njit(cache=True)(_trim_and_cumtime_impl)
+
+try:
+    # Prefer the AOT build when it has been compiled
+    from _align_kernels_aot import trim_and_cumtime  # noqa: F811
+except ImportError:
+    pass
+
+
+if __name__ == '__main__':
+    from numba.pycc import CC
+
+    cc = CC('_align_kernels_aot')
+    cc.export('trim_and_cumtime', _TRIM_CUMTIME_SIG)(_trim_and_cumtime_impl)
+    cc.compile()
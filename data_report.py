@@ -1,10 +1,139 @@
+import numba
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+
+# Cheap Agg-side wins for long time series: aggressive path simplification
+# and chunked path rendering
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
 
 # Assuming synData is your DataFrame
 # synData = pd.read_csv('your_data.csv')  # Example of loading data
 
-def plot_scatter_moving_window(synData, pv_x=None, pv_y=None, window_hours=1, marker='+', layout=(1, 4), normalize=True):
+
+class _FigureCache:
+    """
+    Reuses Figures and their Line2D artists across repeated calls.
+
+    Repeated interactive calls (e.g. from a notebook) with the same key get
+    their line data updated in place and one idle redraw, instead of paying
+    figure and artist construction every time.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    def lookup(self, key):
+        """Return (fig, lines) for key if the figure is still open, else None."""
+        entry = self._entries.get(key)
+        if entry is not None and plt.fignum_exists(entry[0].number):
+            return entry
+        self._entries.pop(key, None)
+        return None
+
+    def store(self, key, fig, lines):
+        self._entries[key] = (fig, lines)
+
+    @staticmethod
+    def update_lines(lines, data_pairs):
+        """Set new (x, y) data on cached lines and redraw their figure."""
+        axes = []
+        for line, (x, y) in zip(lines, data_pairs):
+            line.set_data(x, y)
+            if line.axes not in axes:
+                axes.append(line.axes)
+        for ax in axes:
+            ax.relim()
+            ax.autoscale_view()
+        fig = axes[0].figure
+        # Full (idle) redraw rather than blitting: without restoring a saved
+        # clean background blitting paints over the previous frame, and the
+        # tick labels invalidated by autoscaling could never be blitted anyway
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+
+
+_figure_cache = _FigureCache()
+
+
+@numba.njit(parallel=True, cache=True)
+def _minmax_normalize(a):
+    """
+    Min-max normalize every column of a 2D float array to [0, 1].
+
+    The column minimum and maximum are found together in a single pass over
+    the rows (instead of separate min() and max() traversals), with columns
+    processed in parallel. NaNs are ignored when finding the range, matching
+    the pandas reductions this replaces, and propagate through the output.
+    """
+    n, m = a.shape
+    out = np.empty_like(a)
+    for j in numba.prange(m):
+        mn = np.inf
+        mx = -np.inf
+        for i in range(n):
+            v = a[i, j]
+            if v == v:  # skip NaN
+                if v < mn:
+                    mn = v
+                if v > mx:
+                    mx = v
+        rng = mx - mn
+        for i in range(n):
+            out[i, j] = (a[i, j] - mn) / rng
+    return out
+
+@numba.njit(cache=True)
+def _lttb(x, y, n_out):
+    """
+    Downsample a series to n_out points with Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the points that preserve the visual shape of the curve, so a
+    few thousand output points are indistinguishable on screen from the full
+    series. Inputs shorter than n_out (or n_out < 3) are returned unchanged.
+    """
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    xs = np.empty(n_out)
+    ys = np.empty(n_out)
+    xs[0] = x[0]
+    ys[0] = y[0]
+    every = (n - 2) / (n_out - 2)
+    a = 0  # index of the previously selected point
+    for i in range(n_out - 2):
+        # Average of the next bucket, used as the third triangle vertex
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+
+        # Pick the point of the current bucket forming the largest triangle
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        max_area = -1.0
+        idx = lo
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                idx = j
+        xs[i + 1] = x[idx]
+        ys[i + 1] = y[idx]
+        a = idx
+    xs[n_out - 1] = x[n - 1]
+    ys[n_out - 1] = y[n - 1]
+    return xs, ys
+
+
+def plot_scatter_moving_window(synData, pv_x=None, pv_y=None, window_hours=1, marker='+', layout=(1, 4), normalize=True, backend='scatter'):
     """
     Plots scatter plots of pv_x vs pv_y using a moving time window in subplots.
 
@@ -16,6 +145,9 @@ def plot_scatter_moving_window(synData, pv_x=None, pv_y=None, window_hours=1, ma
     marker (str): The marker style for the scatter plot. Default is '+'.
     layout (tuple): Tuple specifying the layout of the subplots (rows, cols). Default is (1, 4).
     normalize (bool): Whether to normalize the data. Default is True.
+    backend (str): 'scatter' draws individual markers; 'datashader' rasterizes
+        each window into an image, which is much faster above ~50k points.
+        Requires the optional datashader package.
     """
     if pv_x is None:
         pv_x = synData.columns[0]
@@ -24,7 +156,10 @@ def plot_scatter_moving_window(synData, pv_x=None, pv_y=None, window_hours=1, ma
         pv_y = synData.columns.drop(pv_x).tolist()
 
     if normalize:
-        synData = synData.apply(lambda x: (x - x.min()) / (x.max() - x.min()), axis=0)
+        # Normalize all columns in a single fused pass over the underlying
+        # ndarray instead of a per-column apply
+        normed = _minmax_normalize(synData.to_numpy(dtype=np.float64))
+        synData = pd.DataFrame(normed, index=synData.index, columns=synData.columns)
 
     window_size = window_hours * 3600  # the data is in seconds
     rows, cols = layout
@@ -41,24 +176,71 @@ def plot_scatter_moving_window(synData, pv_x=None, pv_y=None, window_hours=1, ma
     fig, axes = plt.subplots(rows, cols, figsize=(15, 4))
     axes = axes.flatten()  # Flatten the axes array for easy iteration
 
+    # Hoist the column lookups out of the window loop; the index is
+    # monotonically increasing time in seconds, so each window can be cut
+    # with searchsorted instead of a full boolean-mask scan per iteration.
+    for pv in pv_y:
+        if pv not in synData.columns:
+            print(f'PV {pv} or {pv_x} not found in the DataFrame.')
+    pv_y = [pv for pv in pv_y if pv in synData.columns]
+    if pv_x not in synData.columns:
+        print(f'PV {pv_x} not found in the DataFrame.')
+        return
+
+    if backend == 'datashader':
+        import datashader as ds
+    elif backend != 'scatter':
+        raise ValueError('Invalid backend. Please choose either "scatter" or "datashader".')
+
+    idx_arr = synData.index.to_numpy()
+    x_arr = synData[pv_x].to_numpy()
+    y_arrs = {pv: synData[pv].to_numpy() for pv in pv_y}
+
+    # One fixed color per PV; the legend is built from proxy artists since
+    # all PVs share a single scatter collection per axis
+    point_colors = plt.get_cmap('tab10')(np.arange(len(pv_y)) % 10)
+    legend_handles = [Line2D([0], [0], linestyle='', marker=marker,
+                             color=point_colors[k], label=pv)
+                      for k, pv in enumerate(pv_y)]
+
     for i in range(total_plots):
-        start_time = synData.index[0] + i * window_size
-        end_time = min(start_time + window_size, synData.index[-1])
-        window_data = synData[(synData.index >= start_time) & (synData.index <= end_time)]
+        start_time = idx_arr[0] + i * window_size
+        end_time = min(start_time + window_size, idx_arr[-1])
+        lo = np.searchsorted(idx_arr, start_time, side='left')
+        hi = np.searchsorted(idx_arr, end_time, side='right')
 
-        if window_data.empty:
+        if lo >= hi:
             break
 
-        for pv in pv_y:
-            if pv in synData.columns and pv_x in synData.columns:
-                axes[i].scatter(window_data[pv_x], window_data[pv], marker=marker, label=pv)
-                axes[i].set_xlabel(pv_x)
-                axes[i].set_title(f'{start_time/3600}-{end_time/3600:.1f} hours')
-                if i == 0:
-                    axes[i].legend()
-                axes[i].grid(True)
-            else:
-                print(f'PV {pv} or {pv_x} not found in the DataFrame.')
+        if backend == 'datashader':
+            for pv in pv_y:
+                # Aggregate the window into a 2D histogram and blit one image
+                # instead of drawing a glyph per point.
+                x_win = x_arr[lo:hi]
+                y_win = y_arrs[pv][lo:hi]
+                cvs = ds.Canvas(plot_width=400, plot_height=300)
+                agg = cvs.points(pd.DataFrame({'x': x_win, 'y': y_win}), 'x', 'y')
+                img = ds.tf.shade(agg).to_pil()
+                axes[i].imshow(np.asarray(img),
+                               extent=[np.nanmin(x_win), np.nanmax(x_win),
+                                       np.nanmin(y_win), np.nanmax(y_win)],
+                               origin='lower', aspect='auto')
+        else:
+            # Stack every PV's points into one collection so the axis draws a
+            # single artist instead of len(pv_y) separate ones; rasterized=True
+            # keeps vector output small and speeds up Agg
+            xs = np.tile(x_arr[lo:hi], len(pv_y))
+            ys = np.concatenate([y_arrs[pv][lo:hi] for pv in pv_y])
+            cs = np.repeat(np.arange(len(pv_y)), hi - lo)
+            axes[i].scatter(xs, ys, marker=marker, c=point_colors[cs], rasterized=True)
+
+        # Axis decoration depends only on the window, so set it once per
+        # subplot rather than once per PV
+        axes[i].set_xlabel(pv_x)
+        axes[i].set_title(f'{start_time/3600}-{end_time/3600:.1f} hours')
+        if i == 0:
+            axes[i].legend(handles=legend_handles)
+        axes[i].grid(True)
 
     plt.tight_layout()
 
@@ -84,15 +266,38 @@ def plot_normalized_synData(synData, pvs=None, legend=True, legend_labels=None):
     """
     if pvs is None:
         pvs = synData.columns.tolist()
-
-    plt.figure(figsize=(10, 6))
-
-    for pv in pvs:
-        if pv in synData.columns:
-            normalized_data = (synData[pv] - synData[pv].min()) / (synData[pv].max() - synData[pv].min())
-            plt.plot(synData.index/3600, normalized_data, label=pv)
-        else:
-            print(f'PV {pv} not found in the DataFrame.')
+    else:
+        for pv in pvs:
+            if pv not in synData.columns:
+                print(f'PV {pv} not found in the DataFrame.')
+        pvs = [pv for pv in pvs if pv in synData.columns]
+
+    # Normalize all selected columns in a single fused pass instead of
+    # recomputing min/max per PV inside the plot loop.
+    normed = _minmax_normalize(synData[pvs].to_numpy(dtype=np.float64))
+    idx_hours = synData.index / 3600
+
+    # On repeat calls with the same PV selection, refresh the cached lines
+    # instead of rebuilding the figure
+    key = ('normalized', tuple(pvs))
+    cached = _figure_cache.lookup(key)
+    if cached is not None:
+        fig, lines = cached
+        # Honor the legend arguments on repeat calls too
+        ax = lines[0].axes
+        if legend:
+            ax.legend(legend_labels if legend_labels is not None else pvs)
+        elif ax.get_legend() is not None:
+            ax.get_legend().remove()
+        _figure_cache.update_lines(lines, [(idx_hours, normed[:, i]) for i in range(len(pvs))])
+        return
+
+    fig = plt.figure(figsize=(10, 6))
+
+    lines = []
+    for i, pv in enumerate(pvs):
+        lines.extend(plt.plot(idx_hours, normed[:, i], label=pv))
+    _figure_cache.store(key, fig, lines)
 
     if legend:
         if legend_labels is None:
@@ -110,7 +315,7 @@ def plot_normalized_synData(synData, pvs=None, legend=True, legend_labels=None):
 # plot_normalized_synData(synData, pvs_to_plot)
 # plot_normalized_synData(synData)  # This will plot all PVs
 
-def subplot_time_synData(synData, pvs=None, layout=(1, 4)):
+def subplot_time_synData(synData, pvs=None, layout=(1, 4), max_points=4000):
     """
     Plots the selected PVs from the synData DataFrame in a subplot style.
     If no PVs are selected, plots all PVs.
@@ -119,6 +324,9 @@ def subplot_time_synData(synData, pvs=None, layout=(1, 4)):
     synData (pd.DataFrame): The DataFrame containing the data.
     pvs (list): List of PVs to plot. If None, plots all PVs.
     layout (tuple): Tuple specifying the layout of the plots (rows, cols).
+    max_points (int): Longer series are downsampled to about this many
+        points with LTTB before plotting; screens cannot resolve more
+        anyway. None disables downsampling.
     """
     rows, cols = layout
     total_plots = cols * rows
@@ -135,22 +343,41 @@ def subplot_time_synData(synData, pvs=None, layout=(1, 4)):
         cols = num_pvs
         rows = 1
         total_plots = num_pvs
-   
+
+    idx_hours = synData.index.to_numpy(dtype=np.float64) / 3600
+    if max_points is None:
+        max_points = len(idx_hours)
+
+    def downsampled(pv):
+        return _lttb(idx_hours, synData[pv].to_numpy(dtype=np.float64), max_points)
+
+    # On repeat calls with the same PVs and layout, refresh the cached lines
+    # and blit instead of rebuilding the subplot grid
+    key = ('subplot_time', tuple(pvs), (rows, cols))
+    cached = _figure_cache.lookup(key)
+    if cached is not None:
+        fig, lines = cached
+        _figure_cache.update_lines(
+            lines, [downsampled(pv) for pv in pvs if pv in synData.columns])
+        return
+
     fig, axes = plt.subplots(rows, cols, figsize=(15, 4))
     axes = axes.flatten()  # Flatten the axes array for easy iteration
 
+    lines = []
     for i in range(total_plots):
         if i >= num_pvs:
             break  # No more PVs to plot
 
         pv = pvs[i]
         if pv in synData.columns:
-            axes[i].plot(synData.index/3600, synData[pv], label=pv)
+            lines.extend(axes[i].plot(*downsampled(pv), label=pv))
             axes[i].set_ylabel(pv)
             if i // cols == rows - 1:  # Only show xlabel if it's in the last row
                 axes[i].set_xlabel('relTime [hours]')
         else:
             print(f'PV {pv} not found in the DataFrame.')
+    _figure_cache.store(key, fig, lines)
 
     # Hide any unused subplots
     for j in range(i + 1, total_plots):
@@ -1,19 +1,70 @@
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-import json
+import hashlib
+import os
+import orjson
 import numpy as np
-from urllib.request import urlopen
+import requests
 import pandas as pd
 import matplotlib.pyplot as plt
 
 # Example usage:
 # obj = DataRetriever(pvNames=['PV1', 'PV2'], endTime='06/05/2023 08:08:08', duration_hour=4.0)
 
+# Local cache of fetched archiver data (feather files keyed by request)
+_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'devicelife')
+
+# Time format used for all user-facing time strings
+_FMT = '%m/%d/%Y %H:%M:%S'
+
+# EPICS time has 7 hour delay, due to UTC time and pacific time difference
+_TIME_DIFF_SEC = 7*3600
+
+from _align_kernels import trim_and_cumtime as _trim_and_cumtime
+from _align_kernels import interp_padded as _interp_padded
+
+
+def _interp_rows(x_new, xp, fp):
+    """
+    Linearly interpolate every row of a 2D array at the same sample points.
+
+    Parameters:
+    - x_new (np.ndarray): Points to interpolate at.
+    - xp (np.ndarray): Increasing x-coordinates of the data, shared by all rows.
+    - fp (np.ndarray): 2D array of shape (n_rows, len(xp)) with the y-values.
+
+    Returns:
+    - np.ndarray: Array of shape (n_rows, len(x_new)); points outside
+      [xp[0], xp[-1]] are filled with NaN, matching
+      np.interp(..., left=np.nan, right=np.nan).
+
+    The bracketing-segment search is done once and reused for every row,
+    instead of one np.interp call (and one searchsorted) per row.
+    """
+    if len(xp) < 2:
+        out = np.tile(fp[:, :1], (1, len(x_new)))
+        out[:, x_new != xp[0]] = np.nan
+        return out
+
+    # side='right' picks the segment after the last duplicate of a repeated
+    # timestamp, which is the value np.interp returns there
+    idx = np.searchsorted(xp, x_new, side='right') - 1
+    idx = np.clip(idx, 0, len(xp) - 2)
+    span = xp[idx + 1] - xp[idx]
+    # Guard repeated time stamps (zero-length segments) against 0/0. A query
+    # only lands on a zero-span segment when clipped onto a duplicate run at
+    # the array end, where np.interp returns the run's last value (w = 1)
+    w = np.where(span == 0, 1.0, (x_new - xp[idx]) / np.where(span == 0, 1, span))
+    out = fp[:, idx] * (1 - w) + fp[:, idx + 1] * w
+    out[:, (x_new < xp[0]) | (x_new > xp[-1])] = np.nan
+    return out
+
+
 class DataRetriever:
     def __init__(self, pvNames: List[str] = None, webServer: str = 'LCLS', 
                  endTime: str = '06/05/2023 08:08:08', 
-                 duration_hour: float = 4.0, startTime: str = None, 
-                 alignSetup: Dict[str, Any] = None):
+                 duration_hour: float = 4.0, startTime: str = None,
+                 alignSetup: Dict[str, Any] = None, cache: bool = True):
         """
         Initializes the DataRetriever class with optional input parameters.
 
@@ -24,6 +75,8 @@ class DataRetriever:
         - duration_hour (float): Duration of the data window in hours.
         - startTime (str): Start time for data collection in 'MM/DD/YYYY HH:MM:SS' format.
         - alignSetup (Dict[str, Any]): Configuration for alignment settings.
+        - cache (bool): Whether to cache fetched data on disk so repeated
+          requests for the same PV and time range skip the archiver.
 
         Example:
         obj = DataRetriever(pvNames=['PV1', 'PV2'], endTime='12/11/2022 06:40:00', duration_hour=6)
@@ -45,19 +98,19 @@ class DataRetriever:
         
         # Calculate missing time parameter based on provided inputs
         if endTime is None and startTime and duration_hour:
-            start_time_dt = datetime.strptime(startTime, '%m/%d/%Y %H:%M:%S')
+            start_time_dt = datetime.strptime(startTime, _FMT)
             end_time_dt = start_time_dt + timedelta(hours=duration_hour)
-            endTime = end_time_dt.strftime('%m/%d/%Y %H:%M:%S')
+            endTime = end_time_dt.strftime(_FMT)
         elif startTime is None and endTime and duration_hour:
-            end_time_dt = datetime.strptime(endTime, '%m/%d/%Y %H:%M:%S')
+            end_time_dt = datetime.strptime(endTime, _FMT)
             start_time_dt = end_time_dt - timedelta(hours=duration_hour)
-            startTime = start_time_dt.strftime('%m/%d/%Y %H:%M:%S')
+            startTime = start_time_dt.strftime(_FMT)
         elif duration_hour is None and startTime and endTime:
-            start_time_dt = datetime.strptime(startTime, '%m/%d/%Y %H:%M:%S')
-            end_time_dt = datetime.strptime(endTime, '%m/%d/%Y %H:%M:%S')
+            start_time_dt = datetime.strptime(startTime, _FMT)
+            end_time_dt = datetime.strptime(endTime, _FMT)
         if startTime and endTime and duration_hour:
-            start_time_dt = datetime.strptime(startTime, '%m/%d/%Y %H:%M:%S')
-            end_time_dt = datetime.strptime(endTime, '%m/%d/%Y %H:%M:%S')
+            start_time_dt = datetime.strptime(startTime, _FMT)
+            end_time_dt = datetime.strptime(endTime, _FMT)
             if abs((end_time_dt - start_time_dt).total_seconds() / 3600 - duration_hour) > 1e-6:
                 raise ValueError("The provided endTime, startTime, and duration_hour do not match the condition: duration_hour = endTime - startTime.")
 
@@ -70,11 +123,26 @@ class DataRetriever:
         else:
             raise ValueError('Invalid web server. Please choose either "LCLS" or "SSRL".')
                
-        self.__endTime = datetime.strptime(endTime, '%m/%d/%Y %H:%M:%S')
+        self.__endTime = datetime.strptime(endTime, _FMT)
         self.__duration_hour = duration_hour
-        self.__startTime = datetime.strptime(startTime, '%m/%d/%Y %H:%M:%S') if startTime else None
+        self.__startTime = datetime.strptime(startTime, _FMT) if startTime else None
         self.__rawData = []
         self.__synData = []
+        self.__cache = cache
+
+        # Persistent HTTP session so synchronous fetches reuse pooled
+        # keep-alive connections instead of a fresh TCP handshake per PV
+        self.__session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32,
+                                                pool_maxsize=32, max_retries=2)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+
+    def __del__(self):
+        try:
+            self.__session.close()
+        except Exception:
+            pass
 
     def set_base_pv(self, base_pv: str, base_id: int = 0, 
                         val_range: List[List[float]] = [[1e3, 1e5]], 
@@ -119,6 +187,56 @@ class DataRetriever:
         self.__alignSetup['Trim'] = Trim 
                         
             
+    def _set_pvNames(self, value):
+        if isinstance(value, str):
+            value = [value]
+        self.__pvNames = value
+
+    def _set_startTime(self, value):
+        value = datetime.strptime(value, _FMT)
+        self.__startTime = value
+        self.__endTime = value + timedelta(hours=self.__duration_hour)
+
+    def _set_endTime(self, value):
+        value = datetime.strptime(value, _FMT)
+        self.__endTime = value
+        self.__startTime = value - timedelta(hours=self.__duration_hour)
+
+    def _set_duration_hour(self, value):
+        if not isinstance(value, (int, float)):
+            raise ValueError("duration_hour must be a number")
+        self.__duration_hour = value
+        self.__startTime = self.__endTime - timedelta(hours=value)
+
+    def _set_alignSetup(self, value):
+        if not isinstance(value, dict):
+            raise ValueError("alignSetup must be a dictionary")
+        required_keys = ['base_id', 'base_pv', 'val_range', 'disTimeAddBack_sec', 'dtResample_sec', 'Trim']
+        for key in required_keys:
+            if key not in value:
+                raise ValueError(f"alignSetup dictionary must contain the key '{key}'")
+        self.__alignSetup = value
+
+    def _set_webServer(self, value):
+        value = value.upper()
+        if value == 'LCLS':
+            self.__webServer = 'http://lcls-archapp.slac.stanford.edu/retrieval/data/getData.json?pv='
+        elif value == 'SSRL':
+            self.__webServer = 'http://spear-arch1.slac.stanford.edu/retrieval/data/getData.json?pv='
+        else:
+            raise ValueError('Invalid web server. Please choose either "LCLS" or "SSRL".')
+
+    # Settable property names dispatched with a single dict lookup instead
+    # of per-call attribute introspection
+    _SETTERS = {
+        'pvNames': _set_pvNames,
+        'startTime': _set_startTime,
+        'endTime': _set_endTime,
+        'duration_hour': _set_duration_hour,
+        'alignSetup': _set_alignSetup,
+        'webServer': _set_webServer,
+    }
+
     def set_property(self, *args, **kwargs):
         """
         Set the property of the DataRetriever instance.
@@ -127,50 +245,20 @@ class DataRetriever:
         - property_name (str): The name of the property to set.
         - value (Any): The value to set for the property.
         """
-        
+
         if len(args) == 2:
-            property_name, value = args
-        else:
-            if len(args) == 1 and isinstance(args[0], dict):
-                kwargs = args[0]
-                for key, value in kwargs.items():
-                    self.set_property(key, value)                
-                return
-            else:
-                raise ValueError("Invalid arguments. Expected either a property name and value, or a dictionary of properties and values.")
-        
-        if hasattr(self, f"_{self.__class__.__name__}__{property_name}"):
-            if property_name == 'pvNames' and isinstance(value, str):
-                value = [value]
-                self.__pvNames = value
-            if property_name in ['endTime', 'startTime']:
-                value = datetime.strptime(value, '%m/%d/%Y %H:%M:%S')
-                if property_name == 'startTime':
-                    self.__startTime = value
-                    self.__endTime = value + timedelta(hours=self.__duration_hour)
-                elif property_name == 'endTime':
-                    self.__endTime = value
-                    self.__startTime = value - timedelta(hours=self.__duration_hour)
-            if property_name == 'duration_hour':
-                if not isinstance(value, (int, float)):
-                    raise ValueError("duration_hour must be a number")
-                else:
-                    self.__duration_hour = value
-                    self.__startTime = self.__endTime - timedelta(hours=value)             
-            if property_name == 'alignSetup':
-                if not isinstance(value, dict):
-                    raise ValueError("alignSetup must be a dictionary")
-                required_keys = ['base_id', 'base_pv', 'val_range', 'disTimeAddBack_sec', 'dtResample_sec', 'Trim']
-                for key in required_keys:
-                    if key not in value:
-                        raise ValueError(f"alignSetup dictionary must contain the key '{key}'")
-                self.__alignSetup = value
+            updates = {args[0]: args[1]}
+        elif len(args) == 1 and isinstance(args[0], dict):
+            updates = dict(args[0])
         else:
-            raise AttributeError(f"'DataRetriever' object has no attribute '{property_name}'")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                self.set_property(key, value)
+            raise ValueError("Invalid arguments. Expected either a property name and value, or a dictionary of properties and values.")
+        updates.update(kwargs)
+
+        for property_name, value in updates.items():
+            setter = self._SETTERS.get(property_name)
+            if setter is None:
+                raise AttributeError(f"'DataRetriever' object has no attribute '{property_name}'")
+            setter(self, value)
 
     def get_property(self, property_name: str) -> Any:
         """
@@ -192,43 +280,225 @@ class DataRetriever:
         Fetch historical data for the specified PVs within a time range.
 
         This method retrieves historical data for each PV in the pvNames list
-        over the specified duration ending at endTime. The data is stored in
-        the rawData attribute.
+        over the specified duration ending at endTime. The requests are
+        batched on a single asyncio event loop with a shared connection pool,
+        so TCP connections are reused across PVs instead of opening one per
+        thread. The data is stored in the rawData attribute.
 
         Example:
         obj.getHistory()
         """
-        import concurrent.futures
+        import asyncio
+        import aiohttp
 
-        startTime = (self.__endTime - timedelta(hours=self.__duration_hour)).strftime('%m/%d/%Y %H:%M:%S')
-        timeRange = [startTime, self.__endTime.strftime('%m/%d/%Y %H:%M:%S')]
         self.__rawData = []
 
         # Initialize progress tracking
         total_pvs = len(self.__pvNames)
-        progress = 0
-
-        # parallelize the data retrieval with ThreadPoolExecutor   
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_to_pv = {executor.submit(self.get_history, pv): pv for pv in self.__pvNames}
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_pv)):
-                pv = future_to_pv[future]
-                data, error = future.result()
-                self.__rawData.append(data)
-                if error:
-                    print(error)
-
-                # Update progress with progress bar
-                progress = (i + 1) / total_pvs
-                bar_length = 40
-                block = int(round(bar_length * progress))
-                progress_bar = f"[{'#' * block + '-' * (bar_length - block)}]"
-                print(f"Progress: {round(progress * 100)}% {progress_bar} - [{pv}]")
 
-        
-        # Convert raw data to pandas DataFrame and associate with PV names
-        raw_data_dict = {pv: pd.DataFrame(data) for pv, data in zip(self.__pvNames, self.__rawData)}
-        self.__rawData = raw_data_dict
+        async def fetch_all():
+            results = {}
+            connector = aiohttp.TCPConnector(limit=32)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                tasks = [asyncio.ensure_future(self._fetch_history(session, pv))
+                         for pv in self.__pvNames]
+                for i, task in enumerate(asyncio.as_completed(tasks)):
+                    pv, data, error = await task
+                    results[pv] = data
+                    if error:
+                        print(error)
+
+                    # Update progress with progress bar
+                    progress = (i + 1) / total_pvs
+                    bar_length = 40
+                    block = int(round(bar_length * progress))
+                    progress_bar = f"[{'#' * block + '-' * (bar_length - block)}]"
+                    print(f"Progress: {round(progress * 100)}% {progress_bar} - [{pv}]")
+            return results
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = asyncio.run(fetch_all())
+        else:
+            # Jupyter/IPython already runs an event loop on this thread and
+            # asyncio.run would refuse; run the fetch on its own thread's loop
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                results = pool.submit(asyncio.run, fetch_all()).result()
+
+        # Associate raw data with PV names, keeping the native secs/vals
+        # ndarrays so downstream access skips pandas indexing entirely
+        self.__rawData = {pv: results[pv] for pv in self.__pvNames}
+
+    def _history_url(self, pv_name: str) -> str:
+        """Build the archiver retrieval URL for a PV over the configured time range."""
+        timeformat = '%Y-%m-%dT%H:%M:%S.%fZ'
+        time_range = [(self.__startTime).strftime(timeformat), self.__endTime.strftime(timeformat)]
+        return f'{self.__webServer}{pv_name}&from={time_range[0]}&to={time_range[1]}'
+
+    def _parse_history(self, data):
+        """
+        Convert a decoded archiver JSON payload into secs/vals arrays clipped
+        to [startTime, endTime].
+
+        Parameters:
+        - data: The decoded JSON response from the archiver.
+
+        Returns:
+        - Dict[str, np.ndarray]: Historical data containing timestamps and values.
+        """
+        # Fill preallocated buffers in a single pass over the samples instead
+        # of building three intermediate Python lists.
+        samples = data[0]['data']
+        n = len(samples)
+        secs = np.empty(n)
+        nanos = np.empty(n)
+        vals = np.empty(n)
+        for i, s in enumerate(samples):
+            secs[i] = s['secs']
+            nanos[i] = s['nanos']
+            vals[i] = s['val']
+        secs = secs + nanos*1e-9 + _TIME_DIFF_SEC
+        return self._clip_history(secs, vals)
+
+    def _stream_history(self, fileobj):
+        """
+        Incrementally parse an archiver JSON response into secs/vals arrays.
+
+        Unlike decoding the whole body up front, samples are consumed as they
+        are parsed and written into geometrically grown numpy buffers, so the
+        peak memory is bounded by the arrays rather than a Python dict per
+        sample for the entire response.
+
+        Parameters:
+        - fileobj: File-like object yielding the JSON response bytes.
+
+        Returns:
+        - Tuple[np.ndarray, np.ndarray]: Sample timestamps and values.
+        """
+        import ijson
+
+        cap = 65536
+        secs = np.empty(cap)
+        vals = np.empty(cap)
+        n = 0
+        for s in ijson.items(fileobj, 'item.data.item'):
+            if n == cap:
+                cap *= 2
+                secs = np.resize(secs, cap)
+                vals = np.resize(vals, cap)
+            secs[n] = float(s['secs']) + float(s['nanos'])*1e-9
+            vals[n] = float(s['val'])
+            n += 1
+        return secs[:n] + _TIME_DIFF_SEC, vals[:n]
+
+    def _clip_history(self, secs, vals):
+        """
+        Clip sorted sample arrays to [startTime, endTime] with boundary points.
+
+        Parameters:
+        - secs (np.ndarray): Sample timestamps, sorted ascending.
+        - vals (np.ndarray): Sample values.
+
+        Returns:
+        - Dict[str, np.ndarray]: Historical data containing timestamps and values.
+        """
+        # Interpolate data at startTime and endTime with the nearest data point
+        start_time_ts = self.__startTime.timestamp()
+        end_time_ts = self.__endTime.timestamp()
+
+        # Archiver samples are already sorted by time, so the arrays stay
+        # monotone if we trim to the requested range first and then attach
+        # the two boundary points with a single concatenate. This avoids the
+        # O(N) copies of np.insert and a full argsort.
+        if __debug__:
+            assert np.all(np.diff(secs) >= 0), 'archiver samples are not time-sorted'
+
+        # The in-range points are the contiguous slice [lo:hi), found with two
+        # binary searches; the nearest out-of-range neighbours provide the
+        # boundary values via a branchless index clamp. The output is filled
+        # directly, with no boolean mask or extra array passes.
+        lo = np.searchsorted(secs, start_time_ts, side='left')
+        hi = np.searchsorted(secs, end_time_ts, side='right')
+        start_val = vals[max(lo - 1, 0)]
+        end_val = vals[min(hi, len(vals) - 1)]
+
+        n_out = hi - lo + 2
+        secs_out = np.empty(n_out)
+        vals_out = np.empty(n_out)
+        secs_out[0] = start_time_ts
+        vals_out[0] = start_val
+        secs_out[1:-1] = secs[lo:hi]
+        vals_out[1:-1] = vals[lo:hi]
+        secs_out[-1] = end_time_ts
+        vals_out[-1] = end_val
+
+        if __debug__:
+            assert secs_out[1] >= start_time_ts - 1e-6 and secs_out[-2] <= end_time_ts + 1e-6, \
+                'clipped history extends beyond the requested time range'
+
+        return {'secs': secs_out, 'vals': vals_out}
+
+    def _cache_path(self, pv_name: str) -> str:
+        """Cache file path for a PV over the configured server and time range."""
+        key = hashlib.sha1(f'{self.__webServer}|{pv_name}|'
+                           f'{self.__startTime.isoformat()}|'
+                           f'{self.__endTime.isoformat()}'.encode()).hexdigest()
+        return os.path.join(_CACHE_DIR, f'{key}.feather')
+
+    def _cache_load(self, path: str):
+        """Return cached secs/vals for path, or None on a cache miss."""
+        if not self.__cache or not os.path.exists(path):
+            return None
+        try:
+            import pyarrow.feather as feather
+            table = feather.read_table(path)
+            return {'secs': table['secs'].to_numpy(), 'vals': table['vals'].to_numpy()}
+        except Exception:
+            # Unreadable cache entries are treated as misses
+            return None
+
+    def _cache_store(self, path: str, rawData):
+        """Write secs/vals to the cache, publishing the file atomically."""
+        if not self.__cache:
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            feather.write_feather(pa.table({'secs': rawData['secs'],
+                                            'vals': rawData['vals']}), tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f'Warning: could not cache data to {path}: {e}')
+
+    async def _fetch_history(self, session, pv_name: str):
+        """
+        Fetch historical data for a given PV on a shared aiohttp session.
+
+        Parameters:
+        - session (aiohttp.ClientSession): Session with the shared connection pool.
+        - pv_name (str): The name of the PV.
+
+        Returns:
+        - Tuple[str, Dict[str, Any], str]: PV name, historical data, and error message (if any).
+        """
+        cache_path = self._cache_path(pv_name)
+        rawData = self._cache_load(cache_path)
+        if rawData is not None:
+            return pv_name, rawData, None
+
+        url = self._history_url(pv_name)
+        try:
+            async with session.get(url) as resp:
+                raw = await resp.read()
+            rawData = self._parse_history(orjson.loads(raw))
+            self._cache_store(cache_path, rawData)
+            return pv_name, rawData, None
+        except Exception as e:
+            return pv_name, {}, f"Warning: The PV {pv_name} is not valid! Error: {e}"
 
     def get_history(self, pv_name: str):
         """
@@ -240,56 +510,25 @@ class DataRetriever:
         Returns:
         - List[Dict[str, Any]]: Historical data containing timestamps and values.
         """
-        timeformat = '%Y-%m-%dT%H:%M:%S.%fZ'
-        timeDiff_sec = 7*3600 # EPICS time has 7 hour delay, due to UTC time and pacific time difference
-        rawData = []
-        time_range = [(self.__startTime).strftime(timeformat), self.__endTime.strftime(timeformat)]
-        url = f'{self.__webServer}{pv_name}&from={time_range[0]}&to={time_range[1]}'
-        
+        cache_path = self._cache_path(pv_name)
+        rawData = self._cache_load(cache_path)
+        if rawData is not None:
+            return rawData, None
+
+        url = self._history_url(pv_name)
         try:
-            with urlopen(url) as req:
-                data = json.load(req)
-                secs = np.array([x['secs'] + x['nanos']/1e9 for x in data[0]['data']]) + timeDiff_sec                
-                vals = np.array([x['val'] for x in data[0]['data']])
-                
-                # Interpolate data at startTime and endTime with the nearest data point
-                start_time_ts = self.__startTime.timestamp()
-                end_time_ts = self.__endTime.timestamp()
-
-                # Find the nearest data point for startTime
-                start_index = np.searchsorted(secs, start_time_ts, side='left')
-                if start_index == 0:
-                    start_val = vals[0]
-                else:
-                    start_val = vals[start_index - 1]
-
-                # Find the nearest data point for endTime
-                end_index = np.searchsorted(secs, end_time_ts, side='right')
-                if end_index == len(secs):
-                    end_val = vals[-1]
-                else:
-                    end_val = vals[end_index]                                  
-
-                # Add interpolated points to secs and vals
-                secs = np.insert(secs, start_index, start_time_ts)
-                vals = np.insert(vals, start_index, start_val)
-                secs = np.insert(secs, end_index + 1, end_time_ts)
-                vals = np.insert(vals, end_index + 1, end_val)
-                
-                # Sort secs from small to large and corresponding sort vals
-                sorted_indices = np.argsort(secs)
-                secs = secs[sorted_indices]
-                vals = vals[sorted_indices]
-                
-                # Filter out data points that are out of the specified time range
-                valid_indices = (secs >= self.__startTime.timestamp()) & (secs <= self.__endTime.timestamp())
-                secs = secs[valid_indices]
-                vals = vals[valid_indices]
-                
-                rawData = {'secs': secs, 'vals': vals}
-                return rawData, None
-        except Exception as e:             
-                return {}, f"Warning: The PV {pv_name} is not valid! Error: {e}"
+            with self.__session.get(url, stream=True) as resp:
+                resp.raise_for_status()
+                # resp.raw yields the wire bytes; have urllib3 decode any
+                # gzip/deflate content-encoding before ijson sees them
+                resp.raw.decode_content = True
+                # Stream-parse so the full JSON body is never resident at once
+                secs, vals = self._stream_history(resp.raw)
+            rawData = self._clip_history(secs, vals)
+            self._cache_store(cache_path, rawData)
+            return rawData, None
+        except Exception as e:
+            return {}, f"Warning: The PV {pv_name} is not valid! Error: {e}"
 
     def alignHistory(self, getHistory: bool = True):
         """
@@ -312,63 +551,64 @@ class DataRetriever:
         timeRange = self.__rawData[self.__alignSetup['base_pv']]['secs']  # Time reference
 
         # Convert to relative time
-        relTime = (timeRange - timeRange.iloc[0])  # in seconds
+        relTime = (timeRange - timeRange[0])  # in seconds
         
         if not self.__alignSetup['Trim']:
             # No Trim
             time_cum = relTime  # Cumulated time
             idt = np.arange(len(timeRange))      # idt: index of data to keep
+            diff_idt = np.empty(0, dtype=np.int64)  # no discontinuities
         else:
-            # Cut off out of range data
-            idt = []
-            for val_range in self.__alignSetup['val_range']:
-                idt_k = (self.__rawData[self.__alignSetup['base_pv']]['vals'] >= val_range[0]) & \
-                    (self.__rawData[self.__alignSetup['base_pv']]['vals'] <= val_range[1])
-                if len(idt) == 0:
-                    idt = idt_k
-                else:
-                    idt += idt_k
-            # Sort and remove duplicates
-            idt = np.where(idt)[0]
-            idt = np.unique(np.sort(idt))
+            # Cut off out of range data and accumulate time in one fused pass
+            # over the base PV instead of per-range masks plus diff/cumsum
+            val_range = np.asarray(self.__alignSetup['val_range'], dtype=np.float64)
+            idt, time_cum, diff_idt = _trim_and_cumtime(
+                self.__rawData[self.__alignSetup['base_pv']]['vals'],
+                relTime,
+                val_range[:, 0], val_range[:, 1],
+                float(self.__alignSetup['disTimeAddBack_sec']))
 
             if len(idt) == 0:
                 print('All data are out of range!')
                 return
 
-            # Adjust time for cut off
-            diff_idt = 1 + np.where(np.diff(idt) > 1)[0]  # Find where it was cut
-            time_inv = np.append(0, np.diff(relTime[idt]))  # reltime in seconds
-            # remove discontinuity by adding back time as defined in alignSetup
-            time_inv[diff_idt] = self.__alignSetup['disTimeAddBack_sec'] 
-            time_cum = np.cumsum(time_inv)
-
         # log the syncrhonized start time
         if len(diff_idt) == 0:
             # all data are in range
-            self.__synData['startTime'] = datetime.fromtimestamp(self.__rawData[self.__alignSetup['base_pv']]['secs'].iloc[0])
+            self.__synData['startTime'] = datetime.fromtimestamp(self.__rawData[self.__alignSetup['base_pv']]['secs'][0])
         else:
-            self.__synData['startTime'] = datetime.fromtimestamp(self.__rawData[self.__alignSetup['base_pv']]['secs'].iloc[diff_idt[0]])
+            self.__synData['startTime'] = datetime.fromtimestamp(self.__rawData[self.__alignSetup['base_pv']]['secs'][diff_idt[0]])
 
         self.__synData['relTime'] = time_cum
 
         # Align data to the baseID with nearest data point
         self.__synData['vals'] = np.zeros((len(self.__pvNames), len(time_cum)))  # Initialize 2D array
 
+        batch_rows = []  # rows interpolated together in one batched call
         for i, pv in enumerate(self.__pvNames):
             raw_data = self.__rawData[pv]
             if pv == self.__alignSetup['base_pv']:
-                self.__synData['vals'][i, :] = raw_data['vals'].iloc[idt]
+                self.__synData['vals'][i, :] = raw_data['vals'][idt]
+            elif len(raw_data['secs']) == 1:
+                # Only one data point -- bad
+                print(f"Warning: Only one data point for PV {pv} -- and will fill with same data")
+                self.__synData['vals'][i, :] = np.full(len(idt), raw_data['vals'][0])
             else:
-                if len(raw_data['secs']) == 1:
-                    # Only one data point -- bad
-                    print(f"Warning: Only one data point for PV {pv} -- and will fill with same data")
-                    self.__synData['vals'][i, :] = np.full(len(idt), raw_data['vals'].iloc[0])
-                else:
-                    self.__synData['vals'][i, :] = np.interp(relTime[idt], 
-                              (raw_data['secs'] - raw_data['secs'].iloc[0]), 
-                              raw_data['vals'], 
-                              left=np.nan, right=np.nan)
+                batch_rows.append(i)
+
+        if batch_rows:
+            # Interpolate all remaining PVs in one batched kernel call; the
+            # per-PV time bases differ in length, so pad them to the widest
+            # series and pass each row's true length
+            widths = [len(self.__rawData[self.__pvNames[i]]['secs']) for i in batch_rows]
+            xp = np.zeros((len(batch_rows), max(widths)))
+            fp = np.zeros_like(xp)
+            for row, i in enumerate(batch_rows):
+                raw_data = self.__rawData[self.__pvNames[i]]
+                xp[row, :widths[row]] = raw_data['secs'] - raw_data['secs'][0]
+                fp[row, :widths[row]] = raw_data['vals']
+            self.__synData['vals'][batch_rows, :] = _interp_padded(
+                relTime[idt], xp, fp, np.asarray(widths, dtype=np.int64))
 
         self.__synData['vals'] = self.__synData['vals'][:, :len(relTime)]  # Ensure the array dimensions match
 
@@ -380,10 +620,10 @@ class DataRetriever:
             print("Error: 'relTime' is empty. Ensure 'relTime' is properly initialized before interpolation.")
             return
 
-        self.__synData['vals'] = np.array([np.interp(reSample, self.__synData['relTime'], 
-                                                   self.__synData['vals'][i, :], 
-                                                   left=np.nan, right=np.nan) 
-                                         for i in range(self.__synData['vals'].shape[0])])
+        # Resample all PVs at once; the segment search over relTime is shared
+        # across rows instead of repeated per PV by np.interp.
+        self.__synData['vals'] = _interp_rows(reSample, self.__synData['relTime'],
+                                              self.__synData['vals'])
         self.__synData['relTime'] = reSample
         
 
@@ -396,7 +636,8 @@ class DataRetriever:
         print(f"Total time of data in hours: {time_cum[-1] / 3600:.1f}")
         
                 
-    def pltHistory(self, pvNames: List[str] = None, plot_raw: bool = True, figNum: int = 1):
+    def pltHistory(self, pvNames: List[str] = None, plot_raw: bool = True, figNum: int = 1,
+                   max_points: int = 4000):
         """
         Plot historical data for the specified PVs.
 
@@ -404,10 +645,15 @@ class DataRetriever:
         - pvNames (List[str]): List of PV names to plot.
         - plot_raw (bool): Whether to plot raw data (True) or aligned data (False).
         - figNum (int): Figure number for the plot.
+        - max_points (int): Longer series are downsampled to about this many
+          points with LTTB before plotting; screens cannot resolve more
+          anyway. None disables downsampling.
 
         Example:
         obj.pltHistory()
         """
+        from data_report import _lttb
+
         if pvNames is None:
             pvNames = self.__pvNames
         else:
@@ -424,7 +670,13 @@ class DataRetriever:
             for pv in pvNames:
                 if pv in self.__rawData:
                     data = self.__rawData[pv]
-                    plt.plot([datetime.fromtimestamp(ts) for ts in data['secs']], data['vals'], label=pv)
+                    secs, vals = data['secs'], data['vals']
+                    if max_points is not None:
+                        secs, vals = _lttb(secs, vals, max_points)
+                    # Convert the whole timestamp array at once; matplotlib
+                    # consumes datetime64 directly through its units system
+                    times = (secs * 1e9).astype('datetime64[ns]')
+                    plt.plot(times, vals, label=pv)
             plt.title(f"Start Time: {self.__startTime}, Duration: {self.__duration_hour:.1f} hours")
             plt.legend(pvNames)
             plt.grid()
@@ -434,9 +686,13 @@ class DataRetriever:
                 print('No aligned data available!')
                 return
 
+            idx_hours = self.__synData.index.to_numpy(dtype=np.float64) / 3600
             plt.figure(figNum)
             for pv in pvNames:
-                plt.plot(self.__synData.index / 3600, self.__synData[pv], label=pv)
+                x, y = idx_hours, self.__synData[pv].to_numpy(dtype=np.float64)
+                if max_points is not None:
+                    x, y = _lttb(x, y, max_points)
+                plt.plot(x, y, label=pv)
             plt.xlabel('Relative Time [hours]')
             plt.legend(pvNames)
             plt.grid()
@@ -1,119 +1,159 @@
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+
+class SSAPVs(NamedTuple):
+    """
+    PV names of one SSA, grouped per signal bucket.
+
+    All leaves are tuples (the result is shared through the lru_cache).
+    `flat` holds every PV once, in bucket order, ready to hand to
+    DataRetriever without re-flattening.
+    """
+    drv_volt: Tuple[str, ...]       # ps voltage for driver
+    drv_cur: Tuple[str, ...]        # ps current for driver
+    drv_pwr: Tuple[str, ...]        # driver output power in mW
+    amp_volt: Tuple[str, ...]       # ps voltage per amp
+    amp_cur: Tuple[str, ...]        # ps current per amp
+    amp_pwr: Tuple[str, ...]        # power per amp
+    fwd: str                        # total forward power
+    ref: str                        # total reflected power
+    temp_cooling: Mapping[str, Tuple[str, ...]]
+    flat: Tuple[str, ...]           # every PV above, flattened
+
+
+def _build_suffix_table():
+    """
+    Build the PV suffix table shared by every cavity.
+
+    Only the ssa_header prefix differs between cavities, so the k=1..3
+    amplifier loop (with its k=3 early cutoffs at I4 and Pwr2) is run once
+    here at import time. Returns the flat tuple of suffixes and a map of
+    bucket name -> slice into that tuple.
+    """
+    buckets = {
+        'drv_volt': [':DA_PS1_V', ':DA_PS2_V'],
+        'drv_cur': [':DA_I1', ':DA_I2'],
+        'drv_pwr': [':DrvPwr_mW'],
+        'amp_volt': [f':FA{k}_PS{j}_V' for k in range(1, 4) for j in (1, 2)],
+        'amp_cur': [f':FA{k}_I{c}' for k in range(1, 4)
+                    for c in range(1, 5 if k == 3 else 9)],
+        'amp_pwr': [f':FA{k}_Pwr{p}' for k in range(1, 4)
+                    for p in range(1, 3 if k == 3 else 5)],
+        'fwd': [':FwdPwr'],
+        'ref': [':RefPwr'],
+    }
+    flat = []
+    slices = {}
+    for name, suffixes in buckets.items():
+        slices[name] = slice(len(flat), len(flat) + len(suffixes))
+        flat.extend(suffixes)
+    return tuple(flat), slices
+
+
+_SUFFIX_TABLE, _SLICES = _build_suffix_table()
+
+# Every valid (LinacSection, Cryomodule) pair; one hash lookup replaces the
+# per-section branch chain on the hot path
+_VALID_LS_CM = frozenset(
+    {(0, 1)} | {(1, c) for c in (2, 3)} |
+    {(2, c) for c in range(4, 16)} | {(3, c) for c in range(16, 36)})
+
+# Per-section messages for the failure path only
+_CM_RANGE_MSG = {
+    0: "For LinacSection 0, Cryomodule must be 1",
+    1: "For LinacSection 1, Cryomodule must be 2 or 3",
+    2: "For LinacSection 2, Cryomodule must be between 4 and 15",
+    3: "For LinacSection 3, Cryomodule must be between 16 and 35",
+}
+
+# Suffixes of every temperature/cooling bucket, shared by every cavity like
+# the table above
+_TEMP_COOLING_SUF = {
+    'HSink': (':DA_HSTemp',) + tuple(
+        f':FA{k}_HSTemp' for k in range(1, 4)),  # heatsink temperature
+    'CltrAir': (':CtrlAirTemp',),       # cooler air temperature
+    'PSAir': (':PSAirTemp',),           # power supply air temperature
+    'HeatExcInAir': (':HXInAirTemp',),  # heat exchanger inlet air temperature
+    'LCWIn': (':LCWInTemp',),           # LCW cooling water inlet temperature
+    'LCWOut': (':LCWOutTemp',),         # LCW cooling water outlet temperature
+    'LCWFlowRate': (':LCWOutFlow',),    # LCW cooling water flow rate
+    'FanSpeed': (':CtrlFanSpeed', ':DA_FanSpeed', ':HXFan4Speed') + tuple(
+        f':{fan}' for k in range(1, 4)
+        for fan in (f'FA{k}_FanSpeed', f'PSFan{k}Speed', f'HXFan{k}Speed')),
+}
+
+
 def getLCLSII_SSA_pv(LinacSection, Cryomodule, Cavity):
     """
     LinacSection: LCLSII linac section, 0, 1, 2, 3
     CryoModule: cryomodule ID
     Cavity: 1 - 8
+
+    Returns an SSAPVs NamedTuple. The result is cached per (LinacSection,
+    Cryomodule, Cavity), so the PV leaves are tuples rather than lists -- do
+    not mutate the returned object. Validation runs on every call; only the
+    PV construction behind it is cached.
     """
-    
-    # Validate inputs
-    if not isinstance(LinacSection, int):
-        raise TypeError("LinacSection must be an integer")
-    if not isinstance(Cryomodule, int):
-        raise TypeError("Cryomodule must be an integer")
-    if not isinstance(Cavity, int):
-        raise TypeError("Cavity must be an integer")
+
+    # Validate inputs; exact-type checks skip isinstance's subclass walk.
+    # Running here, uncached and ahead of the frozenset lookup and the cached
+    # builder, non-int (even unhashable) arguments get these messages rather
+    # than a TypeError out of hash()
+    if not (type(LinacSection) is int and type(Cryomodule) is int
+            and type(Cavity) is int):
+        # Slow path: still accept int subclasses, as isinstance did
+        if not isinstance(LinacSection, int):
+            raise TypeError("LinacSection must be an integer")
+        if not isinstance(Cryomodule, int):
+            raise TypeError("Cryomodule must be an integer")
+        if not isinstance(Cavity, int):
+            raise TypeError("Cavity must be an integer")
 
     # Validate LinacSection and Cryomodule and Cavity
-    if LinacSection not in [0, 1, 2, 3]:
-        raise ValueError("LinacSection must be 0, 1, 2, or 3")
-    
-    if LinacSection == 0 and Cryomodule != 1:
-        raise ValueError("For LinacSection 0, Cryomodule must be 1")
-    elif LinacSection == 1 and Cryomodule not in [2, 3]:
-        raise ValueError("For LinacSection 1, Cryomodule must be 2 or 3")
-    elif LinacSection == 2 and not (4 <= Cryomodule <= 15):
-        raise ValueError("For LinacSection 2, Cryomodule must be between 4 and 15")
-    elif LinacSection == 3 and not (16 <= Cryomodule <= 35):
-        raise ValueError("For LinacSection 3, Cryomodule must be between 16 and 35")
-    
+    if (LinacSection, Cryomodule) not in _VALID_LS_CM:
+        if LinacSection not in _CM_RANGE_MSG:
+            raise ValueError("LinacSection must be 0, 1, 2, or 3")
+        raise ValueError(_CM_RANGE_MSG[LinacSection])
+
     if not (1 <= Cavity <= 8):
         raise ValueError("Cavity must be between 1 and 8")
-    
-    # Create PVs
-    ssa_header = ""
 
-    if Cryomodule < 10:
-        ssa_header = f'ACCL:L{LinacSection}B:0{Cryomodule}{Cavity}0:SSA'
-    else:
-        ssa_header = f'ACCL:L{LinacSection}B:{Cryomodule}{Cavity}0:SSA'
+    return _build_ssa_pvs(LinacSection, Cryomodule, Cavity)
 
-    drv_ps_volt = []       # ps voltage for driver
-    drv_ps_cur = []        # ps current for driver
-    drv_pwr_mW = []        # driver output power in mW
 
-    amp_ps_volt = []       # ps voltage
-    amp_ps_cur = []        # ps current
-    amp_pwr = []       # power for each amp
-    ssa_fwd_pwr = f'{ssa_header}:FwdPwr' # total forward power
-    ssa_ref_pwr = f'{ssa_header}:RefPwr' # total reflected power
+@lru_cache(maxsize=512, typed=True)
+def _build_ssa_pvs(LinacSection, Cryomodule, Cavity):
+    """
+    Build the SSAPVs for already-validated inputs, one cached entry per
+    cavity. Caching sits below the public wrapper so lru_cache's key
+    equality (2.0 == 2, True == 1) can never bypass validation; typed=True
+    additionally keys int subclasses separately.
+    """
+    # Create PVs: prefix the shared suffix table once, then slice the flat
+    # tuple into the drv/amp/pwr buckets
+    ssa_header = f'ACCL:L{LinacSection}B:{Cryomodule:02d}{Cavity}0:SSA'
+    # Interned PV names compare by pointer in downstream dict/set lookups and
+    # are stored once even when built again after a cache eviction
+    flat = tuple(sys.intern(ssa_header + s) for s in _SUFFIX_TABLE)
 
     # temperature and cooling
-    temp_cooling = {
-        'HSink': [],    # heatsink temperature
-        'CltrAir': [],  # cooler air temperature
-        'PSAir': [],    # power supply air temperature
-        'HeatExcInAir': [],     # heat exchanger inlet air temperature
-        'LCWIn': [],    # LCW cooling water inlet temperature
-        'LCWOut': [],    # LCW cooling water outlet temperature
-        'LCWFlowRate': [],  # LCW cooling water flow rate
-        'FanSpeed': []  # fan speed
-    }
-    temp_cooling['HSink'].append(f'{ssa_header}:DA_HSTemp')
-    temp_cooling['CltrAir'].append(f'{ssa_header}:CtrlAirTemp')
-    temp_cooling['PSAir'].append(f'{ssa_header}:PSAirTemp')
-    temp_cooling['HeatExcInAir'].append(f'{ssa_header}:HXInAirTemp')
-    temp_cooling['LCWIn'].append(f'{ssa_header}:LCWInTemp')
-    temp_cooling['LCWOut'].append(f'{ssa_header}:LCWOutTemp')
-    temp_cooling['LCWFlowRate'].append(f'{ssa_header}:LCWOutFlow')
-
-    temp_cooling['FanSpeed'].append(f'{ssa_header}:CtrlFanSpeed')
-    temp_cooling['FanSpeed'].append(f'{ssa_header}:DA_FanSpeed')
-    temp_cooling['FanSpeed'].append(f'{ssa_header}:HXFan4Speed')
-
-    for k in range(1, 4):
-        # for driver
-        if k == 1:
-            drv_ps_volt.append(f'{ssa_header}:DA_PS1_V')
-            drv_ps_volt.append(f'{ssa_header}:DA_PS2_V')
-            drv_ps_cur.append(f'{ssa_header}:DA_I1')
-            drv_ps_cur.append(f'{ssa_header}:DA_I2')
-            drv_pwr_mW.append(f'{ssa_header}:DrvPwr_mW')
-
-        # for amp
-        amp_ps_volt.append(f'{ssa_header}:FA{k}_PS1_V')
-        amp_ps_volt.append(f'{ssa_header}:FA{k}_PS2_V')
-
-        temp_cooling['HSink'].append(f'{ssa_header}:FA{k}_HSTemp')
-        temp_cooling['FanSpeed'].append(f'{ssa_header}:FA{k}_FanSpeed')
-        temp_cooling['FanSpeed'].append(f'{ssa_header}:PSFan{k}Speed')
-        temp_cooling['FanSpeed'].append(f'{ssa_header}:HXFan{k}Speed')
-
-        for cur in range(1, 9):
-            amp_ps_cur.append(f'{ssa_header}:FA{k}_I{cur}')
-            if k == 3 and cur == 4:
-                break
-
-        for pwr in range(1, 5):
-            amp_pwr.append(f'{ssa_header}:FA{k}_Pwr{pwr}')
-            if k == 3 and pwr == 2:
-                break
-
-    pvs = {
-        'drv': {
-            'volt': drv_ps_volt,
-            'cur': drv_ps_cur,
-            'pwr': drv_pwr_mW
-        },
-        'amp': {
-            'volt': amp_ps_volt,
-            'cur': amp_ps_cur,
-            'pwr': amp_pwr
-        },
-        'pwr': {
-            'fwd': ssa_fwd_pwr,
-            'ref': ssa_ref_pwr
-        },
-        'temp_cooling': temp_cooling
-    }
+    # Read-only view: the dict is shared through the lru_cache like the
+    # tuple leaves, so callers must not be able to mutate it
+    temp_cooling = MappingProxyType(
+        {name: tuple(sys.intern(ssa_header + s) for s in suffixes)
+         for name, suffixes in _TEMP_COOLING_SUF.items()})
 
-    return pvs
\ No newline at end of file
+    return SSAPVs(
+        drv_volt=flat[_SLICES['drv_volt']],
+        drv_cur=flat[_SLICES['drv_cur']],
+        drv_pwr=flat[_SLICES['drv_pwr']],
+        amp_volt=flat[_SLICES['amp_volt']],
+        amp_cur=flat[_SLICES['amp_cur']],
+        amp_pwr=flat[_SLICES['amp_pwr']],
+        fwd=flat[_SLICES['fwd']][0],
+        ref=flat[_SLICES['ref']][0],
+        temp_cooling=temp_cooling,
+        flat=flat + tuple(pv for pvs in temp_cooling.values() for pv in pvs))
\ No newline at end of file
@@ -10,33 +10,15 @@ def main():
     # Get the PVs for LinacSection 2, Cryomodule 4, Cavity 1
     pvNames = getLCLSII_SSA_pv(2, 4, 1)    
 
-    # Flatten the dict pvNames values into a list
-    pvNamesFlat = []
-    for key, value in pvNames.items():
-        if isinstance(value, dict):
-            for sub_key, sub_value in value.items():
-                if isinstance(sub_value, list):
-                    pvNamesFlat.extend(sub_value)
-                else:
-                    pvNamesFlat.append(sub_value)
-        elif isinstance(value, list):
-            pvNamesFlat.extend(value)
-        else:
-            pvNamesFlat.append(value)
-   
+    # All PVs as a flat list, precomputed by getLCLSII_SSA_pv
+    pvNamesFlat = list(pvNames.flat)
+
 
     # Create a DataRetriever object
     obj = DataRetriever(webServer='LCLS', pvNames=pvNamesFlat, startTime='06/26/2024 08:08:08', endTime='06/27/2024 08:08:08', duration_hour=24)
 
-    # set base_pv to the forward power
-    obj.set_base_pv(base_pv = pvNames['pwr']['fwd'], val_range = [10, 5000])
-    
-
-
-    alignSettings = obj.get_property('alignSetup')
-    alignSettings['base_pv'] = pvNames['pwr']['fwd']
-
-
+    # set base_pv to the forward power; this updates alignSetup in place
+    obj.set_base_pv(base_pv = pvNames.fwd, val_range = [10, 5000])
 
     plt.ion() # Turn on interactive mode, plot will show up immediately and not block the code
     obj.getHistory()